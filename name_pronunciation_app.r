@@ -3762,6 +3762,153 @@ server <- function(input, output, session) {
     }
   }
 
+  # Helper function: Find the Python executable that runs speak_name.py
+  # Relies on Python being in system PATH (works with requirements.txt on shinyapps.io)
+  # Returns "" if neither python3 nor python is available
+  find_python_cmd <- function() {
+    python_cmd <- Sys.which("python3")
+    if (python_cmd == "" || python_cmd == "python3") {
+      # Try python if python3 not found
+      python_cmd <- Sys.which("python")
+    }
+    if (python_cmd == "" || python_cmd == "python") "" else python_cmd
+  }
+
+  # Path to speak_name.py (shipped in the app directory)
+  speak_name_script <- function() {
+    file.path(getwd(), "speak_name.py")
+  }
+
+  # speak_name.py daemon: one warm Python process serving requests over loopback TCP
+  # Avoids paying Python startup + imports on every ElevenLabs click
+  speak_daemon_port <- as.integer(Sys.getenv("SPEAK_NAME_PORT", "8765"))
+  speak_daemon_failed <- FALSE
+  # The daemon writes two fresh random secrets here (mode 0600) each launch: a token it
+  # requires on every request, so other local users can't drive it with the app's API key,
+  # and a proof it answers pings with, so the app never mistakes another process on the
+  # port for the daemon (and sends it the API key)
+  speak_daemon_token_file <- file.path(getwd(), ".speak_daemon_token")
+  speak_daemon_token <- ""
+  speak_daemon_proof <- ""
+
+  # Helper function: Load the daemon token and proof
+  # Returns FALSE if no daemon has written them (missing, empty, or unreadable file)
+  read_speak_daemon_token <- function() {
+    secrets <- if (file.exists(speak_daemon_token_file)) {
+      tryCatch(
+        suppressWarnings(readLines(speak_daemon_token_file, n = 2, warn = FALSE)),
+        error = function(e) character(0)
+      )
+    } else {
+      character(0)
+    }
+    if (length(secrets) < 2 || secrets[1] == "" || secrets[2] == "") {
+      speak_daemon_token <<- ""
+      speak_daemon_proof <<- ""
+      return(FALSE)
+    }
+    speak_daemon_token <<- secrets[1]
+    speak_daemon_proof <<- secrets[2]
+    TRUE
+  }
+
+  # Helper function: Send one JSON request to the speak_name.py daemon
+  # Returns the parsed JSON response, or NULL if the daemon is not reachable
+  speak_daemon_request <- function(request, timeout = 35) {
+    con <- tryCatch(
+      suppressWarnings(socketConnection(
+        host = "127.0.0.1",
+        port = speak_daemon_port,
+        blocking = TRUE,
+        open = "r+",
+        timeout = timeout
+      )),
+      error = function(e) NULL
+    )
+    if (is.null(con)) return(NULL)
+    on.exit(close(con))
+
+    request$token <- speak_daemon_token
+
+    tryCatch({
+      writeLines(as.character(jsonlite::toJSON(request, auto_unbox = TRUE)), con, useBytes = TRUE)
+      response <- readLines(con, n = 1, encoding = "UTF-8", warn = FALSE)
+      if (length(response) == 0) return(NULL)
+      jsonlite::fromJSON(response)
+    }, error = function(e) NULL)
+  }
+
+  # Helper function: Ping the daemon and check that it answers with the proof
+  # Never connects without a token file, so nothing is sent to whoever holds the port
+  ping_speak_daemon <- function() {
+    if (!read_speak_daemon_token()) return(FALSE)
+    ping <- speak_daemon_request(list(op = "ping"), timeout = 2)
+    !is.null(ping) && isTRUE(ping$success) && identical(ping$proof, speak_daemon_proof)
+  }
+
+  # Helper function: Make sure the speak_name.py daemon is running
+  # Returns TRUE if it answers a ping with the right proof (starting it first if needed)
+  ensure_speak_daemon <- function(python_cmd, py_script) {
+    if (ping_speak_daemon()) return(TRUE)
+
+    # Don't keep retrying a daemon that failed to start - one-shot calls still work
+    if (speak_daemon_failed) return(FALSE)
+
+    # The daemon only writes inside the audio cache directory, which must exist first
+    audio_cache_dir <- file.path(getwd(), ".audio_cache")
+    if (!dir.exists(audio_cache_dir)) {
+      dir.create(audio_cache_dir, showWarnings = FALSE, recursive = TRUE)
+    }
+
+    system2(
+      python_cmd,
+      args = c(shQuote(py_script), "--daemon", shQuote(speak_daemon_token_file), shQuote(audio_cache_dir)),
+      wait = FALSE,
+      stdout = FALSE,
+      stderr = FALSE,
+      env = c("PYTHONIOENCODING=utf-8")
+    )
+
+    # Wait up to ~3 seconds for the daemon to start listening
+    for (attempt in 1:30) {
+      Sys.sleep(0.1)
+      if (ping_speak_daemon()) return(TRUE)
+    }
+
+    speak_daemon_failed <<- TRUE
+    return(FALSE)
+  }
+
+  # Helper function: Warm the ElevenLabs audio cache for a whole roster
+  # Non-blocking: the daemon queues the names and generates them in the background,
+  # so saving or playing any of them later is served from cache
+  prefetch_premium_audio <- function(names, phonetics, ipas, api_key, voice_id) {
+    python_cmd <- find_python_cmd()
+    py_script <- speak_name_script()
+    if (python_cmd == "" || !file.exists(py_script)) return(invisible(FALSE))
+
+    if (!ensure_speak_daemon(python_cmd, py_script)) return(invisible(FALSE))
+
+    # Same phonetic/IPA/speed as the "Save to Saved Names" pre-cache, so cache keys match
+    items <- lapply(seq_along(names), function(i) {
+      list(
+        name = names[i],
+        phonetic = phonetics[i],
+        ipa = if (!is.na(ipas[i])) ipas[i] else "",
+        speed = 1.0
+      )
+    })
+
+    result <- speak_daemon_request(list(
+      op = "prefetch",
+      api_key = api_key,
+      voice_id = voice_id,
+      items = items
+    ), timeout = 5)
+
+    invisible(!is.null(result) && isTRUE(result$success))
+  }
+
   # Helper function: Generate premium audio using ElevenLabs API with phonetic respelling
   generate_premium_audio <- function(name, phonetic_text, api_key, voice_id, speed = 1.0, ipa = NULL) {
     tryCatch({
@@ -3781,15 +3928,10 @@ server <- function(input, output, session) {
       }
 
       # Find Python executable dynamically (supports deployment to servers)
-      # Relies on Python being in system PATH (works with requirements.txt on shinyapps.io)
-      python_cmd <- Sys.which("python3")
-      if (python_cmd == "" || python_cmd == "python3") {
-        # Try python if python3 not found
-        python_cmd <- Sys.which("python")
-      }
+      python_cmd <- find_python_cmd()
 
-      # If Python still not found, return error
-      if (python_cmd == "" || python_cmd == "python") {
+      # If Python not found, return error
+      if (python_cmd == "") {
         return(list(
           success = FALSE,
           error = "Python not available. ElevenLabs Premium requires Python 3. Use Standard Voice instead, or install Python on your system."
@@ -3797,10 +3939,7 @@ server <- function(input, output, session) {
       }
 
       # Path to Python script
-      py_script <- file.path(
-        getwd(),
-        "speak_name.py"
-      )
+      py_script <- speak_name_script()
 
       # Check if Python script exists
       if (!file.exists(py_script)) {
@@ -3820,32 +3959,49 @@ server <- function(input, output, session) {
         ))
       }
 
-      # Call Python script with phonetic respelling and API credentials
-      # Arguments: name, phonetic_text, api_key, voice_id, output_path, speed, ipa
-      # Set PYTHONIOENCODING to ensure UTF-8 handling for special characters
-      result <- system2(
-        python_cmd,  # Use dynamically detected Python
-        args = c(
-          shQuote(py_script),
-          shQuote(name),
-          shQuote(phonetic_text),
-          shQuote(api_key),
-          shQuote(voice_id),
-          shQuote(cache_result$path),
-          as.character(speed),
-          if (!is.null(ipa)) shQuote(ipa) else shQuote("")
-        ),
-        stdout = TRUE,
-        stderr = TRUE,
-        env = c("PYTHONIOENCODING=utf-8")
-      )
+      # Prefer the warm daemon (no Python startup cost per click)
+      json_result <- NULL
+      if (ensure_speak_daemon(python_cmd, py_script)) {
+        json_result <- speak_daemon_request(list(
+          op = "speak",
+          name = name,
+          phonetic = phonetic_text,
+          api_key = api_key,
+          voice_id = voice_id,
+          output_path = cache_result$path,
+          speed = speed,
+          ipa = if (!is.null(ipa)) ipa else ""
+        ))
+      }
 
-      # Parse JSON result
-      json_result <- tryCatch({
-        jsonlite::fromJSON(paste(result, collapse = ""))
-      }, error = function(e) {
-        list(success = FALSE, error = paste("Failed to parse Python output:", paste(result, collapse = " ")))
-      })
+      if (is.null(json_result)) {
+        # Daemon unavailable - call Python script with phonetic respelling and API credentials
+        # Arguments: name, phonetic_text, api_key, voice_id, output_path, speed, ipa
+        # Set PYTHONIOENCODING to ensure UTF-8 handling for special characters
+        result <- system2(
+          python_cmd,  # Use dynamically detected Python
+          args = c(
+            shQuote(py_script),
+            shQuote(name),
+            shQuote(phonetic_text),
+            shQuote(api_key),
+            shQuote(voice_id),
+            shQuote(cache_result$path),
+            as.character(speed),
+            if (!is.null(ipa)) shQuote(ipa) else shQuote("")
+          ),
+          stdout = TRUE,
+          stderr = TRUE,
+          env = c("PYTHONIOENCODING=utf-8")
+        )
+
+        # Parse JSON result
+        json_result <- tryCatch({
+          jsonlite::fromJSON(paste(result, collapse = ""))
+        }, error = function(e) {
+          list(success = FALSE, error = paste("Failed to parse Python output:", paste(result, collapse = " ")))
+        })
+      }
 
       if (json_result$success) {
         # Manage cache size to prevent unbounded growth
@@ -4730,6 +4886,21 @@ server <- function(input, output, session) {
       bulk_results$data <- results_df
       bulk_results$has_data <- TRUE
 
+      # Start generating ElevenLabs audio for the roster in the background (if configured)
+      api_key <- input$elevenlabs_api_key
+      voice_id <- input$elevenlabs_voice_id
+      if (!is.null(api_key) && api_key != "" && !is.na(api_key) &&
+          !is.null(voice_id) && voice_id != "" && !is.na(voice_id) &&
+          nrow(results_df) > 0) {
+        prefetch_premium_audio(
+          as.character(results_df$Name),
+          as.character(results_df$Simple_Phonetic),
+          as.character(results_df$IPA),
+          api_key,
+          voice_id
+        )
+      }
+
       # Success message
       output$bulk_status <- renderUI({
         tags$div(
@@ -5,23 +5,56 @@ speak_name.py - Generate pronunciation audio for a name using ElevenLabs TTS
 Called from R Shiny app via system2()
 
 Usage:
-    python3 speak_name.py "Name" "Phonetic_Text" api_key voice_id [output_path] [speed]
+    python3 speak_name.py "Name" "Phonetic_Text" api_key voice_id [output_path] [speed] [ipa]
+    python3 speak_name.py --daemon token_file output_dir
 
 Phonetic_Text: Clean respelling (e.g., "shuh-KEEL") or IPA if properly formatted
 Returns JSON with success status and audio file path
+
+Daemon mode keeps one warm Python process listening on 127.0.0.1:SPEAK_NAME_PORT
+(default 8765) so the app skips interpreter startup on every click. Protocol is
+line-delimited JSON, one request and one response per line. On startup the daemon
+writes two random secrets to token_file (mode 0600), one per line: a token every
+request must carry as "token", and a proof that ping answers with as "proof" so
+the client can tell the daemon from any other process on the port. Output paths
+must be files directly inside output_dir:
+    {"op": "speak", "name": ..., "phonetic": ..., "ipa": ..., "output_path": ...,
+     "api_key": ..., "voice_id": ..., "speed": ...}
+    {"op": "batch", "api_key": ..., "voice_id": ..., "concurrency": 4,
+     "items": [{"name": ..., "phonetic": ..., "ipa": ..., "output_path": ..., "speed": ...}, ...]}
+    {"op": "prefetch", "api_key": ..., "voice_id": ..., "items": [...]}  (returns immediately)
+    {"op": "ping"}
 """
 
 import sys
-import json
-import requests
-import tempfile
-from pathlib import Path
+import os
+import stat
+import time
+import errno
+import hashlib
+import functools
+import threading
+import contextlib
+
+# orjson (optional) encodes/decodes several times faster than the stdlib json module
+try:
+    import orjson
+
+    _dumpb = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumpb(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
 
-# Ensure UTF-8 encoding for proper IPA character handling
-if sys.stdout.encoding != 'utf-8':
-    sys.stdout.reconfigure(encoding='utf-8')
-if sys.stderr.encoding != 'utf-8':
-    sys.stderr.reconfigure(encoding='utf-8')
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock - index updates still work, just without cross-process locking
+    fcntl = None
 
 # ElevenLabs API Configuration
 # User should set this via environment variable or update it here
@@ -29,38 +62,421 @@ ELEVENLABS_API_KEY = ""  # Will be passed as argument or set as env var
 ELEVENLABS_VOICE_ID = ""  # Will be passed as argument or set as env var
 ELEVENLABS_MODEL = "eleven_turbo_v2"  # Turbo v2 with IPA support (NOT v2.5)
 
-def generate_name_audio(name, phonetic_text, output_path=None, speed=1.0, api_key=None, voice_id=None, ipa=None):
-    """
-    Generate audio pronunciation for a name using ElevenLabs API
+# Request body, serialized once - only the text changes between calls
+_PAYLOAD_TEMPLATE = _dumpb({
+    "text": "__TEXT__",
+    "model_id": ELEVENLABS_MODEL,
+    "voice_settings": {
+        "stability": 0.5,
+        "similarity_boost": 0.75,
+        "style": 0.0,
+        "use_speaker_boost": True
+    }
+})
 
-    Args:
-        name: The name to pronounce
-        phonetic_text: Phonetic respelling (e.g., "shuh-KEEL") or IPA
-        output_path: Optional path for output file (default: temp file)
-        speed: Speech speed multiplier (0.5 to 1.5, default: 1.0)
-        api_key: ElevenLabs API key
-        voice_id: ElevenLabs voice ID
+# Shared HTTP client - keep-alive lets consecutive calls in one process skip the TLS handshake,
+# and with HTTP/2 concurrent batch requests are multiplexed over a single connection
+# Created on first use: importing httpx (ssl, h2, ...) is the bulk of script startup,
+# and cache hits and invalid invocations never need it
+_client = None
+_client_lock = threading.Lock()
 
-    Returns:
-        dict: JSON-serializable result with success, audio_path, and size
+def _get_client():
+    """Return the shared httpx client, importing httpx and creating the client on first call"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import httpx
+            try:
+                import h2  # noqa: F401 - presence enables HTTP/2 in httpx (pip install "httpx[http2]")
+                http2 = True
+            except ImportError:
+                http2 = False
+            _client = httpx.Client(
+                transport=httpx.HTTPTransport(
+                    http2=http2,
+                    retries=2,  # Connection failures only - status retries are handled in _post_stream()
+                    limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+                ),
+                timeout=30.0
+            )
+    return _client
+
+# Transient failures (rate limit, server errors) are retried with a short backoff
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_RETRY_TOTAL = 2
+_RETRY_BACKOFF = 0.25
+
+@contextlib.contextmanager
+def _post_stream(url, headers, body):
+    """POST to ElevenLabs and yield the streamed response, retrying transient failures"""
+    client = _get_client()
+    for attempt in range(_RETRY_TOTAL + 1):
+        with client.stream("POST", url, headers=headers, content=body) as response:
+            if response.status_code not in _RETRY_STATUSES or attempt == _RETRY_TOTAL:
+                yield response
+                return
+            # Honor Retry-After when the server sends one, otherwise back off exponentially
+            retry_after = response.headers.get("Retry-After", "")
+            # (capped so a long Retry-After can't stall the caller past its own timeout)
+            delay = min(float(retry_after), 10.0) if retry_after.isdigit() else _RETRY_BACKOFF * (2 ** attempt)
+        time.sleep(delay)
+
+# Daemon mode settings (loopback only - R's socketConnection() speaks TCP, not Unix sockets)
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = int(os.environ.get("SPEAK_NAME_PORT", 8765))
+# Daemon exits after this many seconds without a request so it never outlives the app for long
+DAEMON_IDLE_TIMEOUT = int(os.environ.get("SPEAK_NAME_DAEMON_IDLE", 1800))
+
+# Temp directory without importing tempfile (saves startup time on every one-shot call)
+if os.name == "posix":
+    _TMPDIR = os.environ.get("TMPDIR") or "/tmp"
+else:
+    _TMPDIR = os.environ.get("TEMP") or os.environ.get("TMP") or "."
+
+# On-disk audio cache shared by every invocation (override with SPEAK_NAME_CACHE)
+# Repeat lookups of the same name are served from here without calling the API
+# Per user and private: /tmp is shared, and cached files are served back as-is
+# (Windows has no uid, but its TEMP directory is already per user)
+_CACHE_DIRNAME = f"speak_name_cache-{os.getuid()}" if hasattr(os, "getuid") else "speak_name_cache"
+CACHE_DIR = os.environ.get("SPEAK_NAME_CACHE", os.path.join(_TMPDIR, _CACHE_DIRNAME))
+try:
+    os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+except OSError:
+    pass
+
+def _is_private_dir(path):
+    """True if path is a real directory (not a symlink) that only the current user can access"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+    if hasattr(os, "getuid"):
+        return st.st_uid == os.getuid() and st.st_mode & 0o077 == 0
+    return True
+
+# makedirs() happily accepts a directory someone else planted at the path (or a symlink
+# to one), so check what is actually there. The cache is an optimization - when it is
+# missing or not private, audio is written straight to output_path instead
+_CACHE_ENABLED = _is_private_dir(CACHE_DIR)
+
+# Cache size budget - least recently used entries are evicted beyond this
+CACHE_MAX_BYTES = int(os.environ.get("SPEAK_NAME_CACHE_MAX_BYTES", 500 * 1024 * 1024))
+# Optional entry lifetime in seconds (0 = entries never expire)
+CACHE_TTL_SECONDS = int(os.environ.get("SPEAK_NAME_CACHE_TTL", 0))
+
+class _CacheIndex:
     """
+    Manifest of the audio cache stored in CACHE_DIR/index.json
 
-    # Validate inputs
-    if not api_key:
-        return {
-            "success": False,
-            "error": "ElevenLabs API key not provided"
-        }
+    Tracks {key: {path, size, last_used, created_at, hits, sha256}} so lookups
+    and eviction never need to scan the cache directory. Use as a context manager:
+    the index is loaded under an exclusive file lock (parallel system2() calls
+    from Shiny stay consistent) and written back atomically on exit.
+    """
 
-    if not voice_id:
-        return {
-            "success": False,
-            "error": "ElevenLabs voice ID not provided"
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.lock_path = os.path.join(cache_dir, "index.lock")
+        self.entries = {}
+        self._dirty = False
+        self._lock_fd = None
+
+    def __enter__(self):
+        self._lock_fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+        if fcntl:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            with open(self.index_path, "rb") as f:
+                self.entries = _loads(f.read())
+        except (OSError, ValueError):
+            # Missing or corrupt index - start over, files are re-registered on use
+            self.entries = {}
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self._dirty and exc_type is None:
+                tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(_dumpb(self.entries))
+                os.replace(tmp_path, self.index_path)
+        finally:
+            # Closing the descriptor releases the lock
+            os.close(self._lock_fd)
+
+    def lookup(self, key, cache_path):
+        """Return the size of a usable cached file (recording the hit), or None"""
+        try:
+            size = os.path.getsize(cache_path)
+        except FileNotFoundError:
+            size = 0
+        if size == 0:
+            if self.entries.pop(key, None) is not None:
+                self._dirty = True
+            return None
+
+        now = time.time()
+        entry = self.entries.get(key)
+        if entry is None:
+            # File written before the index existed - adopt it
+            entry = self.entries[key] = {
+                "path": os.path.basename(cache_path),
+                "size": size,
+                "last_used": now,
+                "created_at": now,
+                "hits": 0
+            }
+        elif CACHE_TTL_SECONDS and now - entry["created_at"] > CACHE_TTL_SECONDS:
+            self._remove(key)
+            self._dirty = True
+            return None
+
+        entry["last_used"] = now
+        entry["hits"] += 1
+        self._dirty = True
+        return size
+
+    def add(self, key, cache_path, size, content_hash=None):
+        """Register a freshly written cache file and evict LRU entries over budget"""
+        if content_hash:
+            self._dedup(key, cache_path, content_hash)
+
+        now = time.time()
+        self.entries[key] = {
+            "path": os.path.basename(cache_path),
+            "size": size,
+            "last_used": now,
+            "created_at": now,
+            "hits": 0,
+            "sha256": content_hash
         }
+        self._dirty = True
 
-    # API endpoint
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+        if self._total_size() <= CACHE_MAX_BYTES:
+            return
+        for old_key in sorted(self.entries, key=lambda k: self.entries[k]["last_used"]):
+            if self._total_size() <= CACHE_MAX_BYTES:
+                break
+            if old_key == key:
+                # Never evict the entry the caller is about to use
+                continue
+            self._remove(old_key)
+
+    def _dedup(self, key, cache_path, content_hash):
+        """
+        Hardlink cache_path to an existing entry with byte-identical audio
+
+        Different names can produce the same MP3 (e.g. "Sean" and "Shawn" with the
+        same IPA), so the file is stored once and shared by both keys.
+        """
+        for other_key, entry in self.entries.items():
+            if other_key == key or entry.get("sha256") != content_hash:
+                continue
+            existing_path = os.path.join(self.cache_dir, entry["path"])
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.link(existing_path, tmp_path)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                # Existing file gone or links unsupported - keep the separate copy
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+            return
+
+    def _total_size(self):
+        """Bytes used on disk - entries sharing one hardlinked file are counted once"""
+        sizes = {}
+        for key, entry in self.entries.items():
+            sizes[entry.get("sha256") or key] = entry["size"]
+        return sum(sizes.values())
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        # Drop the entry's single-flight lock file too so they don't pile up
+        for path in (entry["path"], f"{key}.lock"):
+            try:
+                os.unlink(os.path.join(self.cache_dir, path))
+            except FileNotFoundError:
+                pass
+
+class _BatchCacheIndex:
+    """
+    Stand-in for _CacheIndex during a batch: one index read, one index write
+
+    Lookups answer from a snapshot of index.json taken when the batch starts and
+    every hit/add is queued; commit() replays the queue under a single lock.
+    Without this, each roster item would lock, read, and rewrite the whole index.
+    Safe to share between the batch's worker threads.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        with _CacheIndex(cache_dir) as index:
+            self._snapshot = index.entries
+        self._pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def lookup(self, key, cache_path):
+        try:
+            size = os.path.getsize(cache_path)
+        except FileNotFoundError:
+            return None
+        entry = self._snapshot.get(key)
+        if size == 0 or (entry and CACHE_TTL_SECONDS and time.time() - entry["created_at"] > CACHE_TTL_SECONDS):
+            return None
+        self._pending.append(("lookup", (key, cache_path)))
+        return size
+
+    def add(self, key, cache_path, size, content_hash=None):
+        self._pending.append(("add", (key, cache_path, size, content_hash)))
+
+    def commit(self):
+        """Apply all queued hits and additions (including LRU eviction) in one index update"""
+        with _CacheIndex(self.cache_dir) as index:
+            for op, args in self._pending:
+                if op == "lookup":
+                    index.lookup(*args)
+                else:
+                    index.add(*args)
+        self._pending = []
 
+# Output directories resolved to O_DIRECTORY descriptors, keyed by path
+# The daemon writes every file into the same one or two directories (R's audio cache),
+# so each is resolved and checked for writability once instead of on every request
+_DIR_FD_SUPPORTED = all(func in os.supports_dir_fd for func in (os.open, os.link, os.rename, os.unlink, os.utime))
+_dir_fds = {}
+_dir_fds_lock = threading.Lock()
+
+def _output_dir_fd(dirname, refresh=False):
+    """Return a cached descriptor for an output directory (None where dir_fd is unsupported)"""
+    if not _DIR_FD_SUPPORTED:
+        return None
+    with _dir_fds_lock:
+        if refresh:
+            # Directory was deleted/recreated since it was cached. The stale descriptor
+            # is deliberately not closed: another thread may still be using its number
+            _dir_fds.pop(dirname, None)
+        dir_fd = _dir_fds.get(dirname)
+        if dir_fd is None:
+            dir_fd = os.open(dirname, os.O_RDONLY | os.O_DIRECTORY)
+            if not os.access(dirname, os.W_OK):
+                os.close(dir_fd)
+                raise PermissionError(errno.EACCES, "Permission denied", dirname)
+            _dir_fds[dirname] = dir_fd
+        return dir_fd
+
+def _fast_copy(src, dst):
+    """
+    Copy a cached file to dst as cheaply as the filesystem allows
+
+    Tries, in order: a hardlink (metadata only), an in-kernel copy_file_range(),
+    then a regular copy. dst is always swapped in with os.replace() and never
+    written in place, since an existing dst may be a hardlink to a cache entry.
+    """
+    dirname, basename = os.path.split(os.path.abspath(dst))
+    dir_fd = _output_dir_fd(dirname)
+    try:
+        _fast_copy_at(src, dirname, basename, dir_fd)
+    except FileNotFoundError:
+        # Only a directory deleted and recreated since it was cached warrants a fresh
+        # descriptor - a missing src (e.g. an entry evicted mid-copy) is re-raised as is
+        if dir_fd is None or not _dir_replaced(dirname, dir_fd):
+            raise
+        _fast_copy_at(src, dirname, basename, _output_dir_fd(dirname, refresh=True))
+
+def _dir_replaced(dirname, dir_fd):
+    """True if dirname now exists as a different directory than the one dir_fd refers to"""
+    try:
+        current = os.stat(dirname)
+    except OSError:
+        return False
+    cached = os.fstat(dir_fd)
+    return (current.st_dev, current.st_ino) != (cached.st_dev, cached.st_ino)
+
+def _fast_copy_at(src, dirname, name, dir_fd):
+    """_fast_copy() into dirname/name, relative to directory descriptor dir_fd when given"""
+    if dir_fd is None:
+        # No dir_fd support - use full paths, bare names would resolve against the CWD
+        name = os.path.join(dirname, name)
+    tmp_name = f"{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        try:
+            os.link(src, tmp_name, dst_dir_fd=dir_fd)
+            # A link shares the cache entry's inode and so its old mtime; touch it so
+            # mtime-based cleanup of the output directory (R's manage_cache_size())
+            # sees a freshly written file rather than deleting it first
+            os.utime(tmp_name, dir_fd=dir_fd)
+            os.replace(tmp_name, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+            return
+        except FileNotFoundError:
+            raise
+        except OSError:
+            # Different filesystem (EXDEV), links unsupported, etc. - copy instead
+            pass
+
+        dst_fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+        with open(src, "rb") as src_file, os.fdopen(dst_fd, "wb") as dst_file:
+            copied_in_kernel = False
+            if hasattr(os, "copy_file_range"):
+                try:
+                    remaining = os.fstat(src_file.fileno()).st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(src_file.fileno(), dst_fd, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                    copied_in_kernel = True
+                except OSError as e:
+                    if e.errno not in (errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP):
+                        raise
+                    src_file.seek(0)
+                    dst_file.seek(0)
+                    dst_file.truncate()
+            if not copied_in_kernel:
+                for chunk in iter(lambda: src_file.read(1 << 16), b""):
+                    dst_file.write(chunk)
+        os.replace(tmp_name, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+    finally:
+        try:
+            os.unlink(tmp_name, dir_fd=dir_fd)
+        except FileNotFoundError:
+            pass
+
+def _is_cmu(text):
+    """
+    Detect CMU Arpabet (stress digits 0-2 and no lowercase letters) vs IPA
+
+    Single pass equivalent of:
+        any(char in text for char in ['0', '1', '2']) and text.replace(' ', '').isupper()
+    """
+    has_stress = False
+    has_upper = False
+    for char in text:
+        if char in "012":
+            has_stress = True
+        elif char.isupper():
+            has_upper = True
+        elif char.islower() or char.istitle():
+            return False
+    return has_stress and has_upper
+
+@functools.lru_cache(maxsize=4096)
+def _build_text_to_speak(name, phonetic_text, ipa):
+    """
+    Build the text sent to ElevenLabs for a name
+
+    Memoized - the daemon sees the same (name, phonetic, ipa) repeatedly
+    (e.g. the same student clicked twice in a row).
+    """
     # If IPA/CMU is provided, use SSML phoneme tag for accurate pronunciation
     # ElevenLabs recommends CMU Arpabet over IPA for better consistency
     # Otherwise, use clean phonetic respelling
@@ -70,7 +486,7 @@ def generate_name_audio(name, phonetic_text, output_path=None, speed=1.0, api_ke
         ipa.strip() != ""):
         ipa_clean = ipa.strip().strip('/')
         # Detect if it's CMU Arpabet (contains numbers 0-2 and uppercase) or IPA
-        if any(char in ipa_clean for char in ['0', '1', '2']) and ipa_clean.replace(' ', '').isupper():
+        if _is_cmu(ipa_clean):
             # CMU Arpabet format (recommended by ElevenLabs)
             # Format: <phoneme alphabet='cmu-arpabet' ph='CMU_HERE'>OriginalName</phoneme>
             text_to_speak = f"<phoneme alphabet='cmu-arpabet' ph='{ipa_clean}'>{name}</phoneme>"
@@ -83,92 +499,595 @@ def generate_name_audio(name, phonetic_text, output_path=None, speed=1.0, api_ke
         phonetic_clean = phonetic_text.strip().strip('/')
         text_to_speak = phonetic_clean
 
-    # Prepare payload
-    payload = {
-        "text": text_to_speak,
-        "model_id": ELEVENLABS_MODEL,
-        "voice_settings": {
-            "stability": 0.5,
-            "similarity_boost": 0.75,
-            "style": 0.0,
-            "use_speaker_boost": True
+    return text_to_speak
+
+def _api_error_result(response):
+    """
+    Build the error result for a non-200 ElevenLabs response (body already read)
+
+    Rate limits (still 429 after retries) carry rate_limited/retry_after so batch
+    callers can back off instead of re-submitting straight away.
+    """
+    if response.status_code == 429:
+        retry_after = response.headers.get("Retry-After", "")
+        retry_after = int(retry_after) if retry_after.isdigit() else 1
+        return {
+            "success": False,
+            "error": f"API error 429: rate limited - try again in {retry_after} seconds",
+            "rate_limited": True,
+            "retry_after": retry_after
         }
-    }
 
-    # Headers with authentication
-    headers = {
-        "Accept": "audio/mpeg",
-        "Content-Type": "application/json",
-        "xi-api-key": api_key
+    error_msg = f"API error {response.status_code}"
+    try:
+        error_detail = _loads(response.content).get("detail", {})
+    except (ValueError, AttributeError):
+        # Not JSON (or not a JSON object) - show the raw body instead
+        error_detail = None
+    if isinstance(error_detail, dict) and "message" in error_detail:
+        error_msg = f"{error_msg}: {error_detail['message']}"
+    elif error_detail and not isinstance(error_detail, dict):
+        error_msg = f"{error_msg}: {error_detail}"
+    else:
+        error_msg = f"{error_msg}: {response.text[:200]}"
+    return {
+        "success": False,
+        "error": error_msg
     }
 
+def _serve_from_cache(key, cache_path, output_path, cache_index=None):
+    """Copy cached audio to output_path and return the hit result, or None on a miss"""
+    if not _CACHE_ENABLED:
+        return None
     try:
-        # Make API request
-        response = requests.post(
-            url,
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
+        with cache_index or _CacheIndex(CACHE_DIR) as index:
+            cached_size = index.lookup(key, cache_path)
+        if cached_size:
+            _fast_copy(cache_path, output_path)
+            return {
+                "success": True,
+                "audio_path": output_path,
+                "size": cached_size,
+                "cache": "hit"
+            }
+    except OSError:
+        # Unreadable cache entry - treat as a miss and regenerate it
+        pass
+    return None
 
-        # Check for errors
-        if response.status_code != 200:
-            error_msg = f"API error {response.status_code}"
-            try:
-                error_detail = response.json().get("detail", {})
-                if isinstance(error_detail, dict):
-                    error_msg = f"{error_msg}: {error_detail.get('message', response.text[:200])}"
-                else:
-                    error_msg = f"{error_msg}: {error_detail}"
-            except:
-                error_msg = f"{error_msg}: {response.text[:200]}"
+@contextlib.contextmanager
+def _key_lock(key):
+    """Hold an exclusive lock on CACHE_DIR/<key>.lock (no-op where flock or the cache is unavailable)"""
+    try:
+        lock_fd = None
+        if fcntl and _CACHE_ENABLED:
+            lock_fd = os.open(os.path.join(CACHE_DIR, f"{key}.lock"), os.O_CREAT | os.O_RDWR, 0o644)
+    except OSError:
+        # Cache directory unusable - proceed unlocked, the request itself will still work
+        lock_fd = None
+    if lock_fd is None:
+        yield
+        return
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(lock_fd)
+
+def _cache_key(text_to_speak, voice_id, speed):
+    """Cache key covering everything that changes the generated audio"""
+    # float() so speed=1 and speed=1.0 share an entry
+    return hashlib.sha256(f"{voice_id}|{ELEVENLABS_MODEL}|{float(speed)}|{text_to_speak}".encode("utf-8")).hexdigest()
+
+def generate_name_audio(name, phonetic_text, output_path=None, speed=1.0, api_key=None, voice_id=None, ipa=None,
+                        cache_index=None):
+    """
+    Generate audio pronunciation for a name using ElevenLabs API
+
+    Args:
+        name: The name to pronounce
+        phonetic_text: Phonetic respelling (e.g., "shuh-KEEL") or IPA
+        output_path: Path for output file (required)
+        speed: Speech speed multiplier (0.5 to 1.5, default: 1.0)
+        api_key: ElevenLabs API key
+        voice_id: ElevenLabs voice ID
+        ipa: Optional IPA or CMU Arpabet (sent as an SSML phoneme tag)
+        cache_index: Optional shared _BatchCacheIndex (default: update index.json directly)
+
+    Returns:
+        dict: JSON-serializable result with success, audio_path, and size
+    """
+
+    # Validate inputs
+    if not api_key:
+        return {
+            "success": False,
+            "error": "ElevenLabs API key not provided"
+        }
+
+    if not voice_id:
+        return {
+            "success": False,
+            "error": "ElevenLabs voice ID not provided"
+        }
+
+    # API endpoint
+    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+
+    text_to_speak = _build_text_to_speak(name, phonetic_text, ipa)
+    key = _cache_key(text_to_speak, voice_id, speed)
+
+    # Validate output path (R always provides this, fallback removed to prevent orphan files)
+    if not output_path or not output_path.strip():
+        return {
+            "success": False,
+            "error": "Output path must be provided by calling application"
+        }
+
+    # Fail fast on a missing/read-only output directory (checked once per directory)
+    try:
+        _output_dir_fd(os.path.dirname(os.path.abspath(output_path)))
+    except OSError as e:
+        return {
+            "success": False,
+            "error": f"Cannot write to output directory: {str(e)}"
+        }
+
+    # Check the audio cache before touching the network
+    cache_path = os.path.join(CACHE_DIR, f"{key}.mp3")
+    result = _serve_from_cache(key, cache_path, output_path, cache_index)
+    if result:
+        return result
+
+    # Single flight: concurrent requests for the same missing audio (several teachers
+    # clicking one name, a click racing the roster prefetch) wait here for the first
+    # caller to finish, then find the result in the cache instead of calling the API
+    with _key_lock(key):
+        result = _serve_from_cache(key, cache_path, output_path, cache_index)
+        if result:
+            return result
+
+        # Prepare payload
+        body = _PAYLOAD_TEMPLATE.replace(b'"__TEXT__"', _dumpb(text_to_speak), 1)
+
+        # Headers with authentication
+        headers = {
+            "Accept": "audio/mpeg",
+            "Content-Type": "application/json",
+            "xi-api-key": api_key
+        }
+
+        # Deferred import - only cache misses need the HTTP stack (already loaded after the first call)
+        import httpx
+
+        try:
+            # Make API request (streamed - audio goes to disk chunk by chunk as it arrives)
+            with _post_stream(url, headers, body) as response:
+
+                # Check for errors
+                if response.status_code != 200:
+                    response.read()
+                    return _api_error_result(response)
+
+                # Store in cache atomically (a concurrent reader never sees a partial file)
+                # If the cache directory is unusable, write straight to output_path instead
+                target_path = cache_path
+                tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                f = None
+                if _CACHE_ENABLED:
+                    try:
+                        f = open(tmp_path, "wb")
+                    except OSError:
+                        pass
+                if f is None:
+                    target_path = output_path
+                    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    f = open(tmp_path, "wb")
+                size = 0
+                hasher = hashlib.sha256()  # Content hash lets identical audio share one cache file
+                try:
+                    with f:
+                        for chunk in response.iter_bytes(chunk_size=1 << 14):
+                            f.write(chunk)
+                            size += len(chunk)
+                            hasher.update(chunk)
+                    os.replace(tmp_path, target_path)
+                except BaseException:
+                    # Interrupted download - don't leave partial files behind
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+                    raise
+
+            if target_path == cache_path:
+                try:
+                    with cache_index or _CacheIndex(CACHE_DIR) as index:
+                        index.add(key, cache_path, size, hasher.hexdigest())
+                except OSError:
+                    # The index is bookkeeping only - the file is adopted on its next hit
+                    pass
+
+                # Save audio file
+                _fast_copy(cache_path, output_path)
+
+            return {
+                "success": True,
+                "audio_path": output_path,
+                "size": size,
+                "cache": "miss"
+            }
+
+        except httpx.TimeoutException:
+            return {
+                "success": False,
+                "error": "Request timeout - please try again"
+            }
+        except httpx.TransportError:
             return {
                 "success": False,
-                "error": error_msg
+                "error": "Connection error - check your internet connection"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Unexpected error: {str(e)}"
             }
 
-        # Validate output path (R always provides this, fallback removed to prevent orphan files)
-        if not output_path or not output_path.strip():
+def generate_names_batch(items, api_key, voice_id, concurrency=4):
+    """
+    Generate audio for a whole roster concurrently
+
+    Requests share the pooled client, so the roster is multiplexed over one
+    HTTP/2 connection (or a handful of HTTP/1.1 keep-alives) and overlaps each
+    request's server-side latency. Rate limits (429) are retried with backoff.
+
+    Args:
+        items: List of dicts with name, phonetic, and optional ipa, output_path, speed
+        api_key: ElevenLabs API key
+        voice_id: ElevenLabs voice ID
+        concurrency: Maximum requests in flight at once
+
+    Returns:
+        list: One generate_name_audio() result per item, in input order
+    """
+    def generate_item(item):
+        name = item.get("name", "")
+        phonetic_text = item.get("phonetic", "")
+        error = validate_name_input(name, phonetic_text)
+        if error:
+            return error
+        # Checked per item - an exception here would fail the whole batch, discarding
+        # the results (and queued index updates) of items already generated
+        try:
+            speed = float(item.get("speed", 1.0))
+        except (TypeError, ValueError):
             return {
                 "success": False,
-                "error": "Output path must be provided by calling application"
+                "error": f"Invalid speed: {item.get('speed')!r}"
             }
+        args = (name, phonetic_text, item.get("output_path"), speed,
+                api_key, voice_id, item.get("ipa"), cache_index)
+        result = generate_name_audio(*args)
+        if result.get("rate_limited"):
+            # Still rate limited after the client's own retries - wait as told, then one last try
+            time.sleep(min(result["retry_after"], 10))
+            result = generate_name_audio(*args)
+        return result
+
+    # Deferred import - only the daemon runs batches
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Index updates for the whole roster are written once, after all items finish
+    try:
+        cache_index = _BatchCacheIndex(CACHE_DIR) if _CACHE_ENABLED else None
+    except OSError:
+        # Cache unusable - each item falls back to writing its output directly
+        cache_index = None
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = list(executor.map(generate_item, items))
+    try:
+        if cache_index:
+            cache_index.commit()
+    except OSError:
+        # The index is bookkeeping only - unregistered files are adopted on their next hit
+        pass
+    return results
+
+def prefetch(roster, api_key, voice_id, max_workers=4):
+    """
+    Warm the audio cache for a roster in the background
+
+    Returns immediately. Names already in the cache are skipped; the rest are
+    generated on a background thread pool, so the first click on any student
+    is served from disk instead of waiting on the API.
+
+    Args:
+        roster: List of dicts with name, phonetic, and optional ipa, speed
+        api_key: ElevenLabs API key
+        voice_id: ElevenLabs voice ID
+        max_workers: Maximum requests in flight at once
+
+    Returns:
+        int: Number of names queued for generation
+    """
+    if not api_key or not voice_id or not _CACHE_ENABLED or not os.access(CACHE_DIR, os.W_OK):
+        # Nothing to warm without a usable cache
+        return 0
+
+    pending = {}
+    for item in roster:
+        name = item.get("name", "")
+        phonetic_text = item.get("phonetic", "")
+        if validate_name_input(name, phonetic_text):
+            continue
+        try:
+            speed = float(item.get("speed", 1.0))
+        except (TypeError, ValueError):
+            # Skipped like an empty name, rather than failing the whole prefetch
+            continue
+        key = _cache_key(_build_text_to_speak(name, phonetic_text, item.get("ipa")), voice_id, speed)
+        if key not in pending and not os.path.exists(os.path.join(CACHE_DIR, f"{key}.mp3")):
+            pending[key] = (name, phonetic_text, item.get("ipa"), speed)
+
+    def prefetch_item(key, name, phonetic_text, ipa, speed):
+        # generate_name_audio() fills the cache; the scratch copy it writes is discarded
+        scratch_path = os.path.join(CACHE_DIR, f"{key}.prefetch")
+        result = generate_name_audio(name, phonetic_text, scratch_path, speed, api_key, voice_id, ipa)
+        if result["success"]:
+            try:
+                os.unlink(scratch_path)
+            except FileNotFoundError:
+                pass
 
-        # Save audio file
-        with open(output_path, "wb") as f:
-            f.write(response.content)
+    from concurrent.futures import ThreadPoolExecutor
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    for key, args in pending.items():
+        executor.submit(prefetch_item, key, *args)
+    # Don't wait - workers finish in the background
+    executor.shutdown(wait=False)
+    return len(pending)
 
+def validate_name_input(name, phonetic_text):
+    """Return an error result for empty name/phonetic text, or None if both are usable"""
+    if not name or not name.strip():
         return {
-            "success": True,
-            "audio_path": output_path,
-            "size": len(response.content)
+            "success": False,
+            "error": "Name cannot be empty"
         }
 
-    except requests.exceptions.Timeout:
+    if not phonetic_text or not phonetic_text.strip():
         return {
             "success": False,
-            "error": "Request timeout - please try again"
+            "error": "Phonetic text cannot be empty"
         }
-    except requests.exceptions.ConnectionError:
+
+    return None
+
+def _output_path_error(output_path, output_dir):
+    """Return an error result unless output_path is a file directly inside output_dir"""
+    if output_dir is None:
+        return None
+    # realpath() so ../ segments or a planted symlink can't point a write elsewhere
+    if not output_path or os.path.dirname(os.path.realpath(output_path)) != output_dir:
         return {
             "success": False,
-            "error": "Connection error - check your internet connection"
+            "error": "Output path must be inside the app's audio cache directory"
         }
-    except Exception as e:
+    return None
+
+def handle_request(request, output_dir=None):
+    """
+    Dispatch one daemon request
+
+    Args:
+        request: Decoded JSON object with an "op" field (default: "speak")
+        output_dir: Resolved directory all output files must be written to (None = unrestricted)
+
+    Returns:
+        dict: JSON-serializable result, same shape as generate_name_audio()
+    """
+    op = request.get("op", "speak")
+
+    if op == "ping":
+        return {"success": True}
+
+    if op == "speak":
+        name = request.get("name", "")
+        phonetic_text = request.get("phonetic", "")
+        error = validate_name_input(name, phonetic_text) or _output_path_error(request.get("output_path"), output_dir)
+        if error:
+            return error
+        return generate_name_audio(
+            name,
+            phonetic_text,
+            output_path=request.get("output_path"),
+            speed=float(request.get("speed", 1.0)),
+            api_key=request.get("api_key"),
+            voice_id=request.get("voice_id"),
+            ipa=request.get("ipa")
+        )
+
+    if op == "batch":
+        items = request.get("items")
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return {
+                "success": False,
+                "error": "Batch items must be a list of objects"
+            }
+        for item in items:
+            error = _output_path_error(item.get("output_path"), output_dir)
+            if error:
+                return error
+        results = generate_names_batch(
+            items,
+            api_key=request.get("api_key"),
+            voice_id=request.get("voice_id"),
+            concurrency=int(request.get("concurrency", 4))
+        )
         return {
-            "success": False,
-            "error": f"Unexpected error: {str(e)}"
+            "success": all(result["success"] for result in results),
+            "results": results
         }
 
+    if op == "prefetch":
+        items = request.get("items")
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return {
+                "success": False,
+                "error": "Prefetch items must be a list of objects"
+            }
+        queued = prefetch(
+            items,
+            api_key=request.get("api_key"),
+            voice_id=request.get("voice_id"),
+            max_workers=int(request.get("concurrency", 4))
+        )
+        return {
+            "success": True,
+            "queued": queued
+        }
+
+    return {
+        "success": False,
+        "error": f"Unknown op: {op}"
+    }
+
+def _serve_connection(server, rfile, wfile):
+    """Serve line-delimited JSON requests until the client closes the connection"""
+    from hmac import compare_digest
+    token = server.token.encode("ascii")
+    for line in rfile:
+        if not line.strip():
+            continue
+        server.last_request = time.monotonic()
+        try:
+            request = _loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            # Checked before anything else (ping included) so only the app that
+            # can read the token file gets to use the daemon
+            if not compare_digest(str(request.get("token", "")).encode("utf-8"), token):
+                result = {
+                    "success": False,
+                    "error": "Invalid or missing daemon token"
+                }
+            elif request.get("op") == "ping":
+                # Only this daemon can read the proof back out of the token file
+                result = {
+                    "success": True,
+                    "proof": server.proof
+                }
+            else:
+                result = handle_request(request, server.output_dir)
+        except ValueError as e:
+            result = {
+                "success": False,
+                "error": f"Invalid request: {str(e)}"
+            }
+        except Exception as e:
+            result = {
+                "success": False,
+                "error": f"Unexpected error: {str(e)}"
+            }
+        wfile.write(_dumpb(result) + b"\n")
+        wfile.flush()
+
+def _write_token_file(token_file, token, proof):
+    """Atomically write the daemon token and proof to a file only the current user can read"""
+    tmp_path = f"{token_file}.{os.getpid()}.tmp"
+    try:
+        os.unlink(tmp_path)
+    except FileNotFoundError:
+        pass
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(f"{token}\n{proof}\n")
+    os.replace(tmp_path, token_file)
+
+def run_daemon(token_file, output_dir, host=DAEMON_HOST, port=DAEMON_PORT, idle_timeout=DAEMON_IDLE_TIMEOUT):
+    """
+    Run the warm request server until idle_timeout seconds pass without a request
+
+    Args:
+        token_file: File the per-launch request token and ping proof are written to (mode 0600)
+        output_dir: Directory all output files must be written to (R's audio cache)
+    """
+    # Deferred import - one-shot CLI calls never need the server machinery
+    import socketserver
+
+    class DaemonHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            _serve_connection(self.server, self.rfile, self.wfile)
+
+    class DaemonServer(socketserver.ThreadingTCPServer):
+        allow_reuse_address = os.name == "posix"  # On Windows SO_REUSEADDR would allow a second listener
+        daemon_threads = True
+
+    server = DaemonServer((host, port), DaemonHandler)
+    server.last_request = time.monotonic()
+    server.output_dir = os.path.realpath(output_dir)
+    # Written only once the port is ours, so a second launch can't clobber a live daemon's token
+    server.token = os.urandom(32).hex()
+    server.proof = os.urandom(32).hex()
+    _write_token_file(token_file, server.token, server.proof)
+
+    def shutdown_when_idle():
+        while time.monotonic() - server.last_request < idle_timeout:
+            time.sleep(min(30, idle_timeout))
+        server.shutdown()
+
+    if idle_timeout > 0:
+        threading.Thread(target=shutdown_when_idle, daemon=True).start()
+
+    try:
+        with server:
+            server.serve_forever()
+    finally:
+        try:
+            os.unlink(token_file)
+        except FileNotFoundError:
+            pass
+
+def _print_json(result):
+    """
+    Write a result to stdout as one line of UTF-8 JSON
+
+    Bytes go straight to the binary buffer, so IPA characters come out as UTF-8
+    whatever the stdout encoding is - no sys.stdout.reconfigure() needed
+    (R also runs the script with PYTHONIOENCODING=utf-8).
+    """
+    sys.stdout.buffer.write(_dumpb(result) + b"\n")
+    sys.stdout.buffer.flush()
+
 def main():
     """Main entry point for command-line usage"""
+    if "--daemon" in sys.argv:
+        daemon_args = sys.argv[sys.argv.index("--daemon") + 1:]
+        if len(daemon_args) < 2:
+            _print_json({
+                "success": False,
+                "error": "Usage: python3 speak_name.py --daemon token_file output_dir"
+            })
+            sys.exit(1)
+        try:
+            run_daemon(daemon_args[0], daemon_args[1])
+        except OSError as e:
+            # Port taken (usually another daemon already running) or token file not writable
+            # - caller falls back to CLI mode
+            _print_json({
+                "success": False,
+                "error": f"Daemon could not start on {DAEMON_HOST}:{DAEMON_PORT}: {str(e)}"
+            })
+            sys.exit(1)
+        sys.exit(0)
+
     # Check arguments
     if len(sys.argv) < 5:
         result = {
             "success": False,
             "error": "Usage: python3 speak_name.py \"Name\" \"Phonetic_Text\" api_key voice_id [output_path] [speed] [ipa]"
         }
-        print(json.dumps(result))
+        _print_json(result)
         sys.exit(1)
 
     # Parse arguments
@@ -181,27 +1100,16 @@ def main():
     ipa = sys.argv[7] if len(sys.argv) > 7 else None
 
     # Validate name and phonetic text
-    if not name or not name.strip():
-        result = {
-            "success": False,
-            "error": "Name cannot be empty"
-        }
-        print(json.dumps(result))
-        sys.exit(1)
-
-    if not phonetic_text or not phonetic_text.strip():
-        result = {
-            "success": False,
-            "error": "Phonetic text cannot be empty"
-        }
-        print(json.dumps(result))
+    result = validate_name_input(name, phonetic_text)
+    if result:
+        _print_json(result)
         sys.exit(1)
 
     # Generate audio
     result = generate_name_audio(name, phonetic_text, output_path, speed, api_key, voice_id, ipa)
 
     # Output JSON result
-    print(json.dumps(result))
+    _print_json(result)
 
     # Exit with appropriate code
     sys.exit(0 if result["success"] else 1)